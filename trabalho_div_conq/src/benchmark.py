@@ -2,17 +2,32 @@ from __future__ import annotations
 
 import csv
 import os
+import platform
 import random
 from time import perf_counter
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
-from .classic import mul_classic
-from .strassen import mul_strassen, StrassenStats
-from .matrix import Matrix
+from .classic_py import MatrixPy, mul_classic_py
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def gerar_matriz(n: int, rng: random.Random, minimo: int, maximo: int) -> Matrix:
-    """Gera matriz n x n com inteiros uniformes em [minimo, maximo]."""
+# NumPy, Numba e o Strassen (que depende deles) só são importados dentro de
+# main() quando PYPY não está ativo: com PYPY=1 o benchmark roda apenas o
+# clássico em listas de listas, sem dependências, p.ex.:
+#   PYPY=1 pypy3 -m src.benchmark
+
+
+def gerar_matriz(n: int, rng: np.random.Generator, minimo: int, maximo: int, dtype="float32") -> np.ndarray:
+    """
+    Gera matriz n x n com inteiros uniformes em [minimo, maximo], guardados em `dtype`.
+    Com valores pequenos, float32 é exato e usa o SGEMM do BLAS.
+    """
+    return rng.integers(minimo, maximo + 1, size=(n, n)).astype(dtype)
+
+
+def gerar_matriz_py(n: int, rng: random.Random, minimo: int, maximo: int) -> MatrixPy:
+    """Gera matriz n x n (listas de listas) com inteiros uniformes em [minimo, maximo]."""
     return [[rng.randint(minimo, maximo) for _ in range(n)] for _ in range(n)]
 
 
@@ -35,6 +50,33 @@ def parse_sizes_env(default: List[int]) -> List[int]:
     return [int(x.strip()) for x in sizes_env.split(",") if x.strip()]
 
 
+def aquecer(dtype: np.dtype, cutoff: int) -> None:
+    """
+    Executa os algoritmos uma vez, fora da medição, em matrizes pequenas do
+    `dtype` do benchmark: a compilação/carga do cache do Numba (o combine do
+    Strassen e, em inteiros, o kernel do clássico) não entra no tempo da
+    primeira repetição. Os tamanhos 2*cutoff e 2*cutoff + 1 passam pela
+    recursão e pelo peeling do Strassen. Com a GPU ativa e dtype float, uma
+    multiplicação GPU_MIN_N x GPU_MIN_N cria o contexto CUDA e o handle do
+    cuBLAS antes do primeiro clássico medido.
+    """
+    import numpy as np
+
+    from . import gpu
+    from .classic import mul_classic
+    from .strassen import mul_strassen
+
+    for n in (2 * cutoff, 2 * cutoff + 1):
+        W = np.zeros((n, n), dtype=dtype)
+        mul_strassen(W, W, cutoff)
+        mul_strassen(W, W, cutoff, profile=True)
+        mul_classic(W, W)
+
+    if gpu.ativa() and np.issubdtype(dtype, np.floating):
+        W = np.zeros((gpu.GPU_MIN_N, gpu.GPU_MIN_N), dtype=dtype)
+        gpu.mul_gpu(W, W)
+
+
 def main() -> None:
     
     sizes = parse_sizes_env([64, 128, 256, 512])  
@@ -42,16 +84,41 @@ def main() -> None:
     minimo = int(os.getenv("VAL_MIN", "0"))
     maximo = int(os.getenv("VAL_MAX", "10"))
     repeats = int(os.getenv("REPEATS", "3"))
-    cutoff = int(os.getenv("CUTOFF", "64"))
+    cutoff = int(os.getenv("CUTOFF", "128"))
     out_csv = os.getenv("OUT_CSV", "benchmark_results.csv")
+    pypy = os.getenv("PYPY", "").strip() not in ("", "0")
+    interpretador = platform.python_implementation().lower()
+
+    if pypy:
+        dtype = "int"
+    else:
+        import numpy as np
+
+        from .classic import mul_classic
+        from .matrix import work_dtype
+        from .strassen import mul_strassen, StrassenStats
+
+        # O dtype gravado no CSV é o que os algoritmos usam de fato
+        # (p.ex. DTYPE=int32 roda e é registrado como int64).
+        dtype = work_dtype(np.dtype(os.getenv("DTYPE", "float32")))
+
+        if os.getenv("USE_GPU", "").strip() not in ("", "0"):
+            from . import gpu
+
+            gpu.ativar()
+            print(f"GPU (CuPy/cuBLAS) ativa para multiplicações com n >= {gpu.GPU_MIN_N}")
+
+        aquecer(dtype, max(cutoff, 1))
 
     print("=== Benchmark: Clássico vs Strassen ===")
+    if pypy:
+        print(f"Modo PYPY: apenas clássico em Python puro (listas) | Interpretador: {interpretador}")
     print(f"Tamanhos: {sizes}")
     print(f"Seed base: {seed_base} | Intervalo: [{minimo}, {maximo}]")
-    print(f"Repetições: {repeats} | Cutoff Strassen: {cutoff}")
+    print(f"Repetições: {repeats} | Cutoff Strassen: {cutoff} | dtype: {dtype}")
     print(f"Saída CSV: {out_csv}\n")
 
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+    with open(out_csv, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow([
             "n",
@@ -63,40 +130,69 @@ def main() -> None:
             "seed_base",
             "val_min",
             "val_max",
-            "cutoff"
+            "cutoff",
+            "dtype",
+            "interpretador"
         ])
 
+        # Linhas acumuladas e gravadas de uma vez ao fim de cada n.
+        rows: List[list] = []
+
         for n in sizes:
             print(f"--- n = {n} ---")
 
             for r in range(1, repeats + 1):
                 
                 local_seed = seed_base + (n * 1000) + r
-                rng = random.Random(local_seed)
 
-                A = gerar_matriz(n, rng, minimo, maximo)
-                B = gerar_matriz(n, rng, minimo, maximo)
+                if pypy:
+                    rng_py = random.Random(local_seed)
+                    A = gerar_matriz_py(n, rng_py, minimo, maximo)
+                    B = gerar_matriz_py(n, rng_py, minimo, maximo)
+
+                    t_classic, _ = medir_tempo(mul_classic_py, A, B)
+                    rows.append([
+                        n, "classic", r, f"{t_classic:.9f}", "", "",
+                        seed_base, minimo, maximo, cutoff, dtype, interpretador
+                    ])
+                    print(f"[{r}/{repeats}] classic  : {t_classic:.6f} s ({interpretador}, Python puro)")
+                    continue
+
+                rng = np.random.default_rng(local_seed)
+
+                A = gerar_matriz(n, rng, minimo, maximo, dtype)
+                B = gerar_matriz(n, rng, minimo, maximo, dtype)
 
                 # 1) Clássico
                 t_classic, _ = medir_tempo(mul_classic, A, B)
-                writer.writerow([n, "classic", r, f"{t_classic:.9f}", "", "", seed_base, minimo, maximo, cutoff])
+                rows.append([
+                    n, "classic", r, f"{t_classic:.9f}", "", "",
+                    seed_base, minimo, maximo, cutoff, dtype, interpretador
+                ])
                 print(f"[{r}/{repeats}] classic  : {t_classic:.6f} s")
 
-                # 2) Strassen (com métricas)
-                stats = StrassenStats()
-                t_strassen, (C, stats_out) = medir_tempo(mul_strassen, A, B, cutoff, stats)
+                # 2) Strassen: tempo total sem instrumentação; o tempo de
+                #    split+combine vem de uma segunda execução, com profile=True,
+                #    feita só na 1ª repetição de cada n (nas outras fica vazio).
+                t_strassen, (C, stats_out) = medir_tempo(mul_strassen, A, B, cutoff, StrassenStats())
+                stats_prof = None
+                if r == 1:
+                    _, stats_prof = mul_strassen(A, B, cutoff, StrassenStats(), profile=True)
+                split_combine = f"{stats_prof.split_combine_time:.9f}" if stats_prof else ""
 
-                writer.writerow([
+                rows.append([
                     n, "strassen", r, f"{t_strassen:.9f}",
-                    stats_out.calls, f"{stats_out.split_combine_time:.9f}",
-                    seed_base, minimo, maximo, cutoff
+                    stats_out.calls, split_combine,
+                    seed_base, minimo, maximo, cutoff, dtype, interpretador
                 ])
 
                 print(
-                    f"[{r}/{repeats}] strassen : {t_strassen:.6f} s | "
-                    f"calls={stats_out.calls} | split+combine={stats_out.split_combine_time:.6f} s"
+                    f"[{r}/{repeats}] strassen : {t_strassen:.6f} s | calls={stats_out.calls}"
+                    + (f" | split+combine={stats_prof.split_combine_time:.6f} s" if stats_prof else "")
                 )
 
+            writer.writerows(rows)
+            rows.clear()
             print()
 
     print(f"✅ Benchmark concluído. CSV gerado em: {out_csv}")
@@ -1,44 +1,166 @@
 from __future__ import annotations
 
-from typing import List
+import glob
+import os
+from typing import Tuple
 
-from .matrix import Matrix, zeros, assert_square
+import numpy as np
 
+from . import gpu
+from .matrix import Matrix, as_matrix, assert_square, work_dtype
 
-def mul_classic(A: Matrix, B: Matrix) -> Matrix:
+try:
+    from numba import njit, prange
+except ImportError:  # Numba é opcional: sem ele, usamos o `@` do NumPy.
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _mul_classic_nb(A, B, C, T):
+        """
+        Kernel compilado (Numba) dos 3 laços, na ordem i-k-j e em blocos:
+        para cada faixa de T linhas de A/C e cada faixa de T linhas de B,
+        o laço interno percorre B[k, :] e C[i, :] de forma contígua (o LLVM
+        vetoriza o laço em j, que não é dividido) e a faixa T x n de B é
+        reaproveitada pelas T linhas de C. Cada thread fica com uma faixa de linhas de C,
+        então não há escrita concorrente.
+        """
+        n = A.shape[0]
+        for bi in prange((n + T - 1) // T):
+            ii = bi * T
+            i_end = min(ii + T, n)
+            for kk in range(0, n, T):
+                k_end = min(kk + T, n)
+                for i in range(ii, i_end):
+                    Ci = C[i]
+                    for k in range(kk, k_end):
+                        a = A[i, k]
+                        Bk = B[k]
+                        for j in range(n):
+                            Ci[j] += a * Bk[j]
+
+
+def _l1d_bytes(default: int = 32 * 1024) -> int:
     """
-    Multiplicação clássica de matrizes quadradas (O(n^3)).
-    Implementação "baseline" com 3 laços aninhados.
+    Tamanho do cache L1 de dados da CPU 0, lido de /sys (Linux).
+    Se não for possível descobrir, retorna `default`.
+    """
+    for idx in sorted(glob.glob("/sys/devices/system/cpu/cpu0/cache/index*")):
+        try:
+            with open(os.path.join(idx, "level")) as f:
+                level = f.read().strip()
+            with open(os.path.join(idx, "type")) as f:
+                kind = f.read().strip()
+            with open(os.path.join(idx, "size")) as f:
+                size = f.read().strip()
+        except OSError:
+            continue
+        if level != "1" or kind != "Data":
+            continue
+        mult = {"K": 1024, "M": 1024 * 1024}.get(size[-1:].upper(), 1)
+        digits = size.rstrip("KkMm")
+        if digits.isdigit():
+            return int(digits) * mult
+    return default
 
-    C[i][j] = sum(A[i][k] * B[k][j] for k in 0..n-1)
+
+def tile_from_l1(l1_bytes: int, itemsize: int = 8) -> int:
     """
+    Heurística para o bloco T do kernel: maior potência de 2 com
+    3 * T * T * itemsize <= l1_bytes. Não é um bloco que cabe na L1 (o kernel
+    percorre faixas T x n de B e C); o tamanho da L1 só serve de escala.
+    Medido em n=1024 (int64, L1 de 48 KiB): T de 16 a 32 foi o melhor e
+    T >= 64 ficou ~50% mais lento.
+    """
+    T = 1
+    while 3 * (2 * T) * (2 * T) * itemsize <= l1_bytes:
+        T *= 2
+    return T
+
+
+TILE = tile_from_l1(_l1d_bytes())
+
+# Tolerância absoluta de matrices_equal quando um dos lados é float.
+ATOL_FLOAT = 0.5
+
+
+def _preparar(A: Matrix, B: Matrix) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida A e B (quadradas, mesmo n) e converte as duas para ndarray contíguo
+    no mesmo dtype (work_dtype), p.ex. int64 x float32 -> float64.
+    """
+    A = np.asarray(A)
+    B = np.asarray(B)
     assert_square(A, "A")
     assert_square(B, "B")
 
-    n = len(A)
-    if len(B) != n:
+    if len(B) != len(A):
         raise ValueError("A e B devem ter o mesmo tamanho (n x n).")
 
-    C = zeros(n)
+    dtype = work_dtype(A.dtype, B.dtype)
+    return as_matrix(A, dtype), as_matrix(B, dtype)
 
-    for i in range(n):
-        Ai = A[i]
-        Ci = C[i]
-        for j in range(n):
-            s = 0
-            for k in range(n):
-                s += Ai[k] * B[k][j]
-            Ci[j] = s
 
+def mul_classic(A: Matrix, B: Matrix) -> np.ndarray:
+    """
+    Multiplicação clássica de matrizes quadradas (O(n^3)).
+    Converte as entradas para np.ndarray uma única vez. Em ponto flutuante
+    usa o operador `@` do NumPy (SGEMM/DGEMM do BLAS); em inteiros, que o BLAS
+    não cobre, executa os 3 laços no kernel compilado com Numba (blocos de
+    tamanho TILE), ou o `@` do NumPy se o Numba não estiver instalado.
+    Com a GPU ativada (ver gpu.ativar), matrizes float grandes vão para o cuBLAS.
+
+    C[i][j] = sum(A[i][k] * B[k][j] for k in 0..n-1)
+    """
+    A, B = _preparar(A, B)
+
+    if gpu.usar_gpu(A, B):
+        return gpu.mul_gpu(A, B)
+
+    if njit is None or np.issubdtype(A.dtype, np.floating):
+        return A @ B
+
+    C = np.zeros(A.shape, dtype=A.dtype)
+    _mul_classic_nb(A, B, C, TILE)
+    return C
+
+
+def mul_classic_tiled(A: Matrix, B: Matrix, tile: int = TILE) -> np.ndarray:
+    """
+    Multiplicação clássica (O(n^3)) com cache blocking de tamanho `tile`.
+    O bloco padrão (TILE) é derivado do L1 detectado no import (ver tile_from_l1).
+    Sem Numba, cada bloco tile x tile é multiplicado com o `@` do NumPy.
+    """
+    if tile < 1:
+        raise ValueError("tile deve ser >= 1.")
+
+    A, B = _preparar(A, B)
+    n = A.shape[0]
+    C = np.zeros(A.shape, dtype=A.dtype)
+
+    if njit is not None:
+        _mul_classic_nb(A, B, C, tile)
+        return C
+
+    for ii in range(0, n, tile):
+        for jj in range(0, n, tile):
+            for kk in range(0, n, tile):
+                C[ii:ii + tile, jj:jj + tile] += A[ii:ii + tile, kk:kk + tile] @ B[kk:kk + tile, jj:jj + tile]
     return C
 
 
 def matrices_equal(A: Matrix, B: Matrix) -> bool:
-    """Comparação exata (útil para validar Strassen com pequenos n)."""
-    if len(A) != len(B):
+    """
+    Comparação exata (útil para validar Strassen com pequenos n).
+    Em float, os resultados esperados são inteiros representáveis: toleramos
+    |A - B| <= ATOL_FLOAT em cada posição (np.allclose com rtol=0).
+    """
+    A = np.asarray(A)
+    B = np.asarray(B)
+    if A.shape != B.shape:
         return False
-    n = len(A)
-    for i in range(n):
-        if A[i] != B[i]:
-            return False
-    return True
+    if np.issubdtype(A.dtype, np.floating) or np.issubdtype(B.dtype, np.floating):
+        return bool(np.allclose(A, B, rtol=0, atol=ATOL_FLOAT))
+    return np.array_equal(A, B)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from operator import mul
+from typing import List
+
+MatrixPy = List[List[int]]
+
+
+def mul_classic_py(A: MatrixPy, B: MatrixPy) -> MatrixPy:
+    """
+    Multiplicação clássica em Python puro (listas de listas, sem NumPy/Numba).
+    Serve de baseline "interpretado" e de referência independente.
+
+    B é transposta uma única vez (O(n^2)): cada C[i][j] vira o produto
+    escalar de duas sequências contíguas, A[i] e a coluna j de B, calculado
+    por sum(map(mul, ...)), que roda o laço em k inteiro em C, sem
+    indexação B[k][j] nem bytecode por multiplicação.
+    """
+    n = len(A)
+    if len(B) != n or any(len(row) != n for row in A) or any(len(row) != n for row in B):
+        raise ValueError("A e B devem ser quadradas e ter o mesmo tamanho (n x n).")
+
+    Bt = list(zip(*B))
+
+    return [[sum(map(mul, Ai, Btj)) for Btj in Bt] for Ai in A]
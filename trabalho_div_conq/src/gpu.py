@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from .matrix import Matrix
+
+try:
+    import cupy as cp
+except ImportError:  # CuPy é opcional: sem ele, tudo roda na CPU.
+    cp = None
+
+# Abaixo disso, copiar para a GPU e de volta custa mais que a multiplicação.
+GPU_MIN_N = 1024
+
+_ativo = False
+
+
+def ativar(ativo: bool = True) -> None:
+    """Liga/desliga o uso da GPU (cuBLAS via CuPy) nas multiplicações grandes."""
+    global _ativo
+    if ativo and cp is None:
+        raise RuntimeError("USE_GPU requer o CuPy instalado (pip install cupy-cuda12x).")
+    _ativo = ativo
+
+
+def ativa() -> bool:
+    """True se a GPU foi ativada com ativar()."""
+    return _ativo
+
+
+def usar_gpu(A: Matrix, B: Matrix) -> bool:
+    """
+    True se a GPU está ativa, as matrizes são float e todas as dimensões
+    são >= GPU_MIN_N (inteiros continuam na CPU: o cuBLAS não tem GEMM inteiro).
+    """
+    return (
+        _ativo
+        and np.issubdtype(A.dtype, np.floating)
+        and min(A.shape + B.shape) >= GPU_MIN_N
+    )
+
+
+def mul_gpu(A: Matrix, B: Matrix, out: Optional[Matrix] = None) -> Matrix:
+    """
+    C = A @ B no cuBLAS, com um stream por chamada. No Strassen, os produtos
+    com h >= GPU_MIN_N vêm para cá (ver strassen._caso_base); quando eles são
+    disparados em threads (parallel_depth >= 1), as cópias e GEMMs de
+    produtos diferentes podem se sobrepor na GPU.
+    """
+    with cp.cuda.Stream(non_blocking=True) as stream:
+        Ag = cp.asarray(A)
+        Bg = cp.asarray(B)
+        C = cp.asnumpy(Ag @ Bg, stream=stream)
+        stream.synchronize()
+
+    if out is None:
+        return C
+    out[...] = C
+    return out
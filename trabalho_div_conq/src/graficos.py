@@ -1,42 +1,19 @@
 from __future__ import annotations
 
-import csv
-from collections import defaultdict
-from statistics import mean
 import matplotlib.pyplot as plt
+import pandas as pd
 
 ARQUIVO_CSV = "benchmark_results.csv"
 
 
-def to_float(value):
-    if value in ("", None):
-        return None
-    return float(value)
-
-
-def to_int(value):
-    if value in ("", None):
-        return None
-    return int(value)
-
-
 def carregar_dados():
     """
-    Lê o CSV gerado pelo benchmark e padroniza tipos.
+    Lê o CSV gerado pelo benchmark em um DataFrame (parsing e tipos feitos em C).
     Espera colunas:
       n, algoritmo, repeticao, tempo_total_seg, strassen_calls, strassen_split_combine_seg, ...
+    Campos vazios (ex.: strassen_calls do clássico) viram NaN.
     """
-    dados = []
-    with open(ARQUIVO_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row["n"] = int(row["n"])
-            row["repeticao"] = int(row["repeticao"])
-            row["tempo_total_seg"] = to_float(row["tempo_total_seg"])
-            row["strassen_calls"] = to_int(row["strassen_calls"])
-            row["strassen_split_combine_seg"] = to_float(row["strassen_split_combine_seg"])
-            dados.append(row)
-    return dados
+    return pd.read_csv(ARQUIVO_CSV)
 
 
 def media_por_n_e_algoritmo(dados, campo):
@@ -46,27 +23,16 @@ def media_por_n_e_algoritmo(dados, campo):
       medias_classic (lista)
       medias_strassen (lista)
     """
-    bucket = defaultdict(list)
+    g = dados.groupby(["n", "algoritmo"])[campo].mean().unstack()
+    g = g.reindex(columns=["classic", "strassen"])
+    return g.index.tolist(), g["classic"].tolist(), g["strassen"].tolist()
 
-    for d in dados:
-        n = d["n"]
-        alg = d["algoritmo"]
-        val = d.get(campo)
-        if val is None:
-            continue
-        bucket[(n, alg)].append(val)
 
-    tamanhos = sorted(set(d["n"] for d in dados))
-
-    classic = []
-    strassen = []
-    for n in tamanhos:
-        classic_vals = bucket.get((n, "classic"), [])
-        strassen_vals = bucket.get((n, "strassen"), [])
-        classic.append(mean(classic_vals) if classic_vals else None)
-        strassen.append(mean(strassen_vals) if strassen_vals else None)
-
-    return tamanhos, classic, strassen
+def media_strassen_por_n(dados, campo):
+    """Retorna (tamanhos, médias) de `campo` nas linhas do Strassen, ignorando vazios."""
+    strassen = dados[dados["algoritmo"] == "strassen"]
+    medias = strassen.groupby("n")[campo].mean().dropna()
+    return medias.index.tolist(), medias.tolist()
 
 
 def usar_escala_log(valores1, valores2=None):
@@ -105,14 +71,7 @@ def grafico_tempo_medio(dados, nome_arquivo="tempo_medio.png"):
 
 
 def grafico_calls_strassen(dados, nome_arquivo="calls_strassen.png"):
-   
-    bucket = defaultdict(list)
-    for d in dados:
-        if d["algoritmo"] == "strassen" and d["strassen_calls"] is not None:
-            bucket[d["n"]].append(d["strassen_calls"])
-
-    tamanhos = sorted(bucket.keys())
-    medias = [mean(bucket[n]) for n in tamanhos]
+    tamanhos, medias = media_strassen_por_n(dados, "strassen_calls")
 
     log = usar_escala_log(medias)
 
@@ -129,13 +88,7 @@ def grafico_calls_strassen(dados, nome_arquivo="calls_strassen.png"):
 
 
 def grafico_split_combine_strassen(dados, nome_arquivo="split_combine_strassen.png"):
-    bucket = defaultdict(list)
-    for d in dados:
-        if d["algoritmo"] == "strassen" and d["strassen_split_combine_seg"] is not None:
-            bucket[d["n"]].append(d["strassen_split_combine_seg"])
-
-    tamanhos = sorted(bucket.keys())
-    medias = [mean(bucket[n]) for n in tamanhos]
+    tamanhos, medias = media_strassen_por_n(dados, "strassen_split_combine_seg")
 
     log = usar_escala_log(medias)
 
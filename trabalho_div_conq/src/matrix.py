@@ -1,107 +1,77 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import Optional, Tuple
 
-Matrix = List[List[int]]
+import numpy as np
 
-def zeros(n: int) -> Matrix:
-    """Cria uma matriz n x n preenchida com 0."""
-    return [[0 for _ in range(n)] for _ in range(n)]
+Matrix = np.ndarray
 
+DTYPE = np.int64
+FLOAT_DTYPES = (np.float32, np.float64)
 
-def add(A: Matrix, B: Matrix) -> Matrix:
-    """Retorna A + B (mesmo tamanho)."""
-    n = len(A)
-    C = zeros(n)
-    for i in range(n):
-        Ai = A[i]
-        Bi = B[i]
-        Ci = C[i]
-        for j in range(n):
-            Ci[j] = Ai[j] + Bi[j]
-    return C
-
-
-def sub(A: Matrix, B: Matrix) -> Matrix:
-    """Retorna A - B (mesmo tamanho)."""
-    n = len(A)
-    C = zeros(n)
-    for i in range(n):
-        Ai = A[i]
-        Bi = B[i]
-        Ci = C[i]
-        for j in range(n):
-            Ci[j] = Ai[j] - Bi[j]
-    return C
 
-
-def split(A: Matrix) -> Tuple[Matrix, Matrix, Matrix, Matrix]:
+def work_dtype(*dtypes) -> np.dtype:
     """
-    Divide uma matriz n x n (n par) em 4 quadrantes:
-    A11 A12
-    A21 A22
+    dtype em que as contas são feitas para operandos de `dtypes`
+    (np.result_type entre eles): float32/float64 mantêm o dtype (caminho BLAS),
+    outros floats sobem para float64 e inteiros/bool viram DTYPE.
     """
-    n = len(A)
-    mid = n // 2
-
-    A11 = [row[:mid] for row in A[:mid]]
-    A12 = [row[mid:] for row in A[:mid]]
-    A21 = [row[:mid] for row in A[mid:]]
-    A22 = [row[mid:] for row in A[mid:]]
-
-    return A11, A12, A21, A22
-
+    dtype = np.result_type(*dtypes)
+    if dtype in FLOAT_DTYPES:
+        return dtype
+    if dtype.kind == "f" and dtype.itemsize < 8:
+        return np.dtype(np.float64)
+    if dtype.kind in "biu":
+        return np.dtype(DTYPE)
+    raise TypeError(f"dtype não suportado: {dtype}")
 
-def combine(C11: Matrix, C12: Matrix, C21: Matrix, C22: Matrix) -> Matrix:
-    """Combina 4 quadrantes em uma matriz única."""
-    mid = len(C11)
-    n = mid * 2
-    C = zeros(n)
 
-    for i in range(mid):
-        C[i][:mid] = C11[i]
-        C[i][mid:] = C12[i]
+def as_matrix(A, dtype=None) -> Matrix:
+    """
+    Converte A (lista de listas ou ndarray) para ndarray contíguo em `dtype`
+    (por padrão, work_dtype(A.dtype)).
+    """
+    A = np.asarray(A)
+    if dtype is None:
+        dtype = work_dtype(A.dtype)
+    return np.ascontiguousarray(A, dtype=dtype)
 
-    for i in range(mid):
-        C[i + mid][:mid] = C21[i]
-        C[i + mid][mid:] = C22[i]
 
-    return C
+def add(A: Matrix, B: Matrix, out: Optional[Matrix] = None) -> Matrix:
+    """Retorna A + B (mesmo tamanho). Se `out` for dado, escreve nele (sem alocar)."""
+    return np.add(A, B, out=out)
 
 
-def next_power_of_two(n: int) -> int:
-    """Retorna a menor potência de 2 >= n."""
-    p = 1
-    while p < n:
-        p <<= 1
-    return p
+def sub(A: Matrix, B: Matrix, out: Optional[Matrix] = None) -> Matrix:
+    """Retorna A - B (mesmo tamanho). Se `out` for dado, escreve nele (sem alocar)."""
+    return np.subtract(A, B, out=out)
 
 
-def pad_to_size(A: Matrix, new_n: int) -> Matrix:
+def split(A: Matrix) -> Tuple[Matrix, Matrix, Matrix, Matrix]:
     """
-    Faz padding com zeros para transformar A (n x n) em (new_n x new_n).
-    Assumimos new_n >= n.
+    Divide uma matriz n x n (n par) em 4 quadrantes:
+    A11 A12
+    A21 A22
+
+    Os quadrantes são views de A (sem cópia): escrever neles altera A.
     """
     n = len(A)
-    P = zeros(new_n)
-
-    for i in range(n):
-        Pi = P[i]
-        Ai = A[i]
-        for j in range(n):
-            Pi[j] = Ai[j]
-
-    return P
+    mid = n // 2
 
+    A11 = A[:mid, :mid]
+    A12 = A[:mid, mid:]
+    A21 = A[mid:, :mid]
+    A22 = A[mid:, mid:]
 
-def crop(A: Matrix, n: int) -> Matrix:
-    """Corta a matriz A para o tamanho n x n (usado após padding)."""
-    return [row[:n] for row in A[:n]]
+    return A11, A12, A21, A22
 
 
 def is_square(A: Matrix) -> bool:
-    """Validação simples: matriz quadrada."""
-    n = len(A)
-    return all(len(row) == n for row in A)
+    """Validação simples: matriz quadrada (2-D, n x n). Listas irregulares não são."""
+    try:
+        A = np.asarray(A)
+    except ValueError:
+        return False
+    return A.ndim == 2 and A.shape[0] == A.shape[1]
 
 
 def assert_square(A: Matrix, name: str = "A") -> None:
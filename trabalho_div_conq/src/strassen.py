@@ -1,21 +1,51 @@
 from __future__ import annotations
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from time import perf_counter
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
+
+from . import gpu
 from .matrix import (
     Matrix,
     add,
     sub,
     split,
-    combine,
-    next_power_of_two,
-    pad_to_size,
-    crop,
+    as_matrix,
     assert_square,
+    work_dtype,
 )
-from .classic import mul_classic
+try:
+    from numba import njit
+except ImportError:  # Numba é opcional: sem ele, a combinação usa ufuncs com out=.
+    njit = None
+
+
+# Buffers de trabalho por tamanho de quadrante h: S1..S4, T1..T4 + P1..P7.
+ScratchPool = Dict[int, List[Matrix]]
+_N_OPERANDOS = 8
+_N_SCRATCH = _N_OPERANDOS + 7
+
+# (X, Y, M): um dos 7 produtos, M = X @ Y.
+Product = Tuple[Matrix, Matrix, Matrix]
+
+# Nos níveis de recursão < parallel_depth, P1..P7 são calculados em threads.
+# O caso base (BLAS) e a combinação (Numba, nogil) liberam o GIL.
+# Desligado por padrão: o BLAS do NumPy já usa todos os núcleos em cada GEMM,
+# então 7 (ou 49) chamadores concorrentes disputam as mesmas CPUs, e cada
+# tarefa tem seu próprio pool de buffers. Sem medição de ganho em máquina
+# com vários núcleos, o padrão fica sequencial.
+WORKERS = os.cpu_count() or 1
+PARALLEL_DEPTH = 0
+
+# Um executor por nível: tarefas de um nível só esperam por tarefas do nível
+# seguinte, então um executor nunca fica travado esperando por ele mesmo.
+_executors: List[ThreadPoolExecutor] = []
+_executors_lock = threading.Lock()
 
 
 @dataclass
@@ -25,24 +55,188 @@ class StrassenStats:
     - calls: número de chamadas recursivas (quantas vezes strassen_rec foi chamada)
     - split_combine_time: tempo gasto SOMENTE em particionar (split) e combinar (combine),
       além de somas/subtrações necessárias ao Strassen (overhead estrutural).
+      Só é medido quando mul_strassen é chamado com profile=True.
     """
     calls: int = 0
     split_combine_time: float = 0.0
 
 
-def mul_strassen(A: Matrix, B: Matrix, cutoff: int = 64, stats: Optional[StrassenStats] = None) -> Tuple[Matrix, StrassenStats]:
+if njit is not None:
+
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _combine_nb(P1, P2, P3, P4, P5, P6, P7, C):
+        """
+        Calcula os 4 quadrantes de C em uma única passada sobre P1..P7.
+        Sequencial e sem GIL: o paralelismo vem das threads de _strassen_rec.
+        """
+        h = P1.shape[0]
+        for i in range(h):
+            for j in range(h):
+                p2 = P2[i, j]
+                p5 = P5[i, j]
+                u1 = P1[i, j] + p2
+                u2 = u1 + P6[i, j]
+                C[i, j] = p2 + P3[i, j]
+                C[i, j + h] = u1 + p5 + P4[i, j]
+                C[i + h, j] = u2 - P7[i, j]
+                C[i + h, j + h] = u2 + p5
+
+    @njit(fastmath=True)
+    def _strassen_nb(A, B, C, cutoff):
+        """
+        Strassen-Winograd inteiro em código compilado: a recursão não passa
+        pelo interpretador e o caso base (n <= cutoff) são os laços i-k-j.
+        A, B e C são sempre C-contíguas (os quadrantes são copiados), então há
+        uma única especialização por dtype.
+
+        Sem cache=True: o cache em disco do Numba não suporta funções
+        recursivas (a versão carregada do cache quebra com segfault).
+        """
+        n = A.shape[0]
+
+        if n <= cutoff:
+            for i in range(n):
+                Ci = C[i]
+                Ci[:] = 0
+                for k in range(n):
+                    a = A[i, k]
+                    Bk = B[k]
+                    for j in range(n):
+                        Ci[j] += a * Bk[j]
+            return
+
+        h = n // 2
+        A11 = np.ascontiguousarray(A[:h, :h])
+        A12 = np.ascontiguousarray(A[:h, h:])
+        A21 = np.ascontiguousarray(A[h:, :h])
+        A22 = np.ascontiguousarray(A[h:, h:])
+        B11 = np.ascontiguousarray(B[:h, :h])
+        B12 = np.ascontiguousarray(B[:h, h:])
+        B21 = np.ascontiguousarray(B[h:, :h])
+        B22 = np.ascontiguousarray(B[h:, h:])
+
+        S1 = A21 + A22
+        S2 = S1 - A11
+        S3 = A11 - A21
+        S4 = A12 - S2
+        T1 = B12 - B11
+        T2 = B22 - T1
+        T3 = B22 - B12
+        T4 = T2 - B21
+
+        P1 = np.empty((h, h), dtype=C.dtype)
+        P2 = np.empty((h, h), dtype=C.dtype)
+        P3 = np.empty((h, h), dtype=C.dtype)
+        P4 = np.empty((h, h), dtype=C.dtype)
+        P5 = np.empty((h, h), dtype=C.dtype)
+        P6 = np.empty((h, h), dtype=C.dtype)
+        P7 = np.empty((h, h), dtype=C.dtype)
+
+        _strassen_nb(S2, T2, P1, cutoff)
+        _strassen_nb(A11, B11, P2, cutoff)
+        _strassen_nb(A12, B21, P3, cutoff)
+        _strassen_nb(S4, B22, P4, cutoff)
+        _strassen_nb(S1, T1, P5, cutoff)
+        _strassen_nb(S3, T3, P6, cutoff)
+        _strassen_nb(A22, T4, P7, cutoff)
+
+        _combine_nb(P1, P2, P3, P4, P5, P6, P7, C)
+
+
+def _combine(P1: Matrix, P2: Matrix, P3: Matrix, P4: Matrix, P5: Matrix, P6: Matrix, P7: Matrix, C: Matrix) -> None:
+    """
+    Escreve os quadrantes de C diretamente a partir de P1..P7 (Winograd):
+      U1 = P1 + P2    U2 = U1 + P6
+      C11 = P2 + P3   C12 = U1 + P5 + P4
+      C21 = U2 - P7   C22 = U2 + P5
+    São 7 somas/subtrações (contra 8 no Strassen original), sem matrizes
+    temporárias: U1 e U2 são montados dentro dos próprios quadrantes de C.
+    """
+    if njit is not None:
+        _combine_nb(P1, P2, P3, P4, P5, P6, P7, C)
+        return
+
+    C11, C12, C21, C22 = split(C)
+
+    add(P1, P2, out=C12)    # U1
+    add(C12, P6, out=C21)   # U2
+    add(C21, P5, out=C22)
+    sub(C21, P7, out=C21)
+    add(C12, P5, out=C12)
+    add(C12, P4, out=C12)
+    add(P2, P3, out=C11)
+
+
+def _mul_base(A: Matrix, B: Matrix, C: Matrix) -> None:
+    """
+    Caso base (n <= cutoff): C = A @ B via BLAS (GEMM do OpenBLAS/MKL do NumPy).
+    Também usado nas faixas retangulares do peeling (ver mul_strassen).
+    O BLAS só tem kernels de ponto flutuante; para inteiros, multiplicamos em
+    float64, que é exato enquanto |C[i][j]| < 2**53 (verificado antes).
+    Fora dessa faixa, usamos o `@` inteiro do NumPy.
+    """
+    if np.issubdtype(C.dtype, np.floating):
+        np.matmul(A, B, out=C)
+        return
+
+    limite = int(np.abs(A).max(initial=0)) * int(np.abs(B).max(initial=0)) * A.shape[1]
+    if limite < 2 ** 53:
+        C[...] = A.astype(np.float64) @ B.astype(np.float64)
+    else:
+        np.matmul(A, B, out=C)
+
+
+def _scratch(pool: ScratchPool, h: int, dtype) -> List[Matrix]:
+    """
+    Buffers h x h reutilizáveis para um nível da recursão.
+    Uma chamada de tamanho 2h só usa os buffers de tamanho h, e as chamadas
+    de mesmo tamanho acontecem uma depois da outra (busca em profundidade),
+    então um único conjunto por tamanho basta.
+    """
+    bufs = pool.get(h)
+    if bufs is None:
+        bufs = [np.empty((h, h), dtype=dtype) for _ in range(_N_SCRATCH)]
+        pool[h] = bufs
+    return bufs
+
+
+def _executor(depth: int) -> ThreadPoolExecutor:
+    """
+    Executor (criado sob demanda) das tarefas disparadas no nível `depth`.
+    A criação fica sob lock: threads do nível anterior podem pedir o mesmo
+    executor ao mesmo tempo.
+    """
+    with _executors_lock:
+        while len(_executors) <= depth:
+            _executors.append(ThreadPoolExecutor(max_workers=WORKERS))
+        return _executors[depth]
+
+
+def mul_strassen(
+    A: Matrix,
+    B: Matrix,
+    cutoff: int = 128,
+    stats: Optional[StrassenStats] = None,
+    parallel_depth: int = PARALLEL_DEPTH,
+    profile: bool = False,
+) -> Tuple[Matrix, StrassenStats]:
     """
     Multiplicação de matrizes usando Strassen.
 
     Requisitos atendidos:
     - Divide recursivamente em quadrantes
-    - Faz as 7 multiplicações de Strassen
+    - Faz as 7 multiplicações de Strassen (variante de Winograd: 15 somas/subtrações)
     - Combina resultados
-    - Trata tamanhos que NÃO são potência de 2 (padding + crop)
+    - Trata tamanhos que NÃO são potência de 2 (peeling dinâmico, sem padding)
     - Mede estatísticas: chamadas recursivas + tempo de particionamento/combinação
+      (o tempo só é medido com profile=True: os perf_counter() em cada nível
+      distorcem o tempo total, então a medição fica para uma execução à parte)
+    - Nos `parallel_depth` primeiros níveis, as 7 multiplicações rodam em threads
 
     Retorna: (C, stats)
     """
+    A = np.asarray(A)
+    B = np.asarray(B)
     assert_square(A, "A")
     assert_square(B, "B")
 
@@ -50,78 +244,277 @@ def mul_strassen(A: Matrix, B: Matrix, cutoff: int = 64, stats: Optional[Strasse
     if len(B) != n:
         raise ValueError("A e B devem ter o mesmo tamanho (n x n).")
 
+    dtype = work_dtype(A.dtype, B.dtype)
+    A = as_matrix(A, dtype)
+    B = as_matrix(B, dtype)
+
     if stats is None:
         stats = StrassenStats()
 
-    m = next_power_of_two(n)
-    if m != n:
-        A_pad = pad_to_size(A, m)
-        B_pad = pad_to_size(B, m)
-        C_pad = _strassen_rec(A_pad, B_pad, cutoff, stats)
-        C = crop(C_pad, n)
-        return C, stats
+    pool: ScratchPool = {}
+
+    m = _bloco_strassen(n, cutoff)
+
+    C = np.empty((n, n), dtype=A.dtype)
+    _strassen_rec(A[:m, :m], B[:m, :m], C[:m, :m], cutoff, stats, pool, 0, parallel_depth, profile)
+    _completar_peeling(A, B, C, m)
 
-    C = _strassen_rec(A, B, cutoff, stats)
     return C, stats
 
 
-def _strassen_rec(A: Matrix, B: Matrix, cutoff: int, stats: StrassenStats) -> Matrix:
+def _bloco_strassen(n: int, cutoff: int) -> int:
     """
-    Parte recursiva do Strassen.
-    Aqui contamos calls e acumulamos split_combine_time.
+    Peeling dinâmico: com L níveis de recursão até chegar em blocos <= cutoff,
+    o Strassen roda no maior bloco m x m (m múltiplo de 2^L), que se divide ao
+    meio exatamente em todos os níveis. Retorna m.
+    """
+    L = 0
+    while (n >> L) > max(cutoff, 1):
+        L += 1
+    return (n >> L) << L
 
-    cutoff:
-      - Se n <= cutoff, usamos a multiplicação clássica (reduz overhead em Python).
+
+def _completar_peeling(A: Matrix, B: Matrix, C: Matrix, m: int) -> None:
+    """
+    Com C[:m, :m] = A[:m, :m] @ B[:m, :m] já calculado, completa C = A @ B
+    tratando as p = n - m últimas linhas e colunas com produtos retangulares
+    (posto p) via BLAS.
     """
-    stats.calls += 1
     n = len(A)
+    if m == n:
+        return
 
-    if n == 1:
-        return [[A[0][0] * B[0][0]]]
+    C11 = C[:m, :m]
+    T = np.empty((m, m), dtype=C.dtype)
+    _mul_base(A[:m, m:], B[m:, :m], T)
+    add(C11, T, out=C11)
+    _mul_base(A[:m, :], B[:, m:], C[:m, m:])
+    _mul_base(A[m:, :], B, C[m:, :])
 
-    if n <= cutoff:
-        return mul_classic(A, B)
 
-    t0 = perf_counter()
+def make_strassen(cutoff: int = 128, dtype=np.float32) -> Callable[[Matrix, Matrix], Matrix]:
+    """
+    Cria uma multiplicação Strassen-Winograd compilada inteira com Numba
+    (_strassen_nb) para `cutoff` e `dtype` fixos: a recursão acontece dentro do
+    código compilado, sem despacho do Python a cada chamada, e o caso base são
+    os laços i-k-j. A compilação para `dtype` acontece aqui, uma vez por
+    processo (aquecimento com uma matriz 2*cutoff x 2*cutoff).
+
+    Retorna mul(A, B) -> C; tamanhos que não são potência de 2 usam o mesmo
+    peeling de mul_strassen. Não coleta StrassenStats.
+    Sem Numba, retorna um wrapper de mul_strassen com o mesmo cutoff.
+    """
+    dtype = np.dtype(dtype)
+    c = max(int(cutoff), 1)
 
-    A11, A12, A21, A22 = split(A)
-    B11, B12, B21, B22 = split(B)
+    def _entrada(X) -> Matrix:
+        return np.ascontiguousarray(X, dtype=dtype)
+
+    if njit is None:
+
+        def mul_fallback(A: Matrix, B: Matrix) -> Matrix:
+            return mul_strassen(_entrada(A), _entrada(B), c)[0]
+
+        return mul_fallback
 
+    def mul(A: Matrix, B: Matrix) -> Matrix:
+        assert_square(A, "A")
+        assert_square(B, "B")
 
-    A11_plus_A22 = add(A11, A22)
-    B11_plus_B22 = add(B11, B22)
+        n = len(A)
+        if len(B) != n:
+            raise ValueError("A e B devem ter o mesmo tamanho (n x n).")
 
-    A21_plus_A22 = add(A21, A22)
-    B12_minus_B22 = sub(B12, B22)
+        A = _entrada(A)
+        B = _entrada(B)
+        m = _bloco_strassen(n, c)
 
-    B21_minus_B11 = sub(B21, B11)
-    A11_plus_A12 = add(A11, A12)
+        C = np.empty((n, n), dtype=dtype)
+        C_m = np.empty((m, m), dtype=dtype)
+        _strassen_nb(np.ascontiguousarray(A[:m, :m]), np.ascontiguousarray(B[:m, :m]), C_m, c)
+        C[:m, :m] = C_m
+        _completar_peeling(A, B, C, m)
+        return C
 
-    A21_minus_A11 = sub(A21, A11)
-    B11_plus_B12 = add(B11, B12)
+    aquecimento = np.zeros((2 * c, 2 * c), dtype=dtype)
+    mul(aquecimento, aquecimento)
 
-    A12_minus_A22 = sub(A12, A22)
-    B21_plus_B22 = add(B21, B22)
+    return mul
 
-    stats.split_combine_time += perf_counter() - t0
 
-    M1 = _strassen_rec(A11_plus_A22, B11_plus_B22, cutoff, stats)
-    M2 = _strassen_rec(A21_plus_A22, B11, cutoff, stats)
-    M3 = _strassen_rec(A11, B12_minus_B22, cutoff, stats)
-    M4 = _strassen_rec(A22, B21_minus_B11, cutoff, stats)
-    M5 = _strassen_rec(A11_plus_A12, B22, cutoff, stats)
-    M6 = _strassen_rec(A21_minus_A11, B11_plus_B12, cutoff, stats)
-    M7 = _strassen_rec(A12_minus_A22, B21_plus_B22, cutoff, stats)
+def _caso_base(A: Matrix, B: Matrix, C: Matrix, cutoff: int, raiz: bool = False) -> bool:
+    """
+    Resolve C = A @ B direto se n == 1 ou n <= cutoff e retorna True.
+
+    cutoff:
+      - Se n <= cutoff, multiplicamos direto via BLAS (Strassen "híbrido"): abaixo
+        desse tamanho, as 15 somas/subtrações não compensam a multiplicação economizada.
+
+    GPU (ver gpu.ativar):
+      - Fora da raiz (raiz=False), produtos float com n >= gpu.GPU_MIN_N vão
+        inteiros para o cuBLAS: P1..P7 do primeiro nível (ou do primeiro
+        nível em que h >= GPU_MIN_N) não são mais divididos na CPU.
+    """
+    n = len(A)
 
-    t1 = perf_counter()
+    if n == 1:
+        C[0, 0] = A[0, 0] * B[0, 0]
+        return True
 
-    C11 = add(sub(add(M1, M4), M5), M7)
-    C12 = add(M3, M5)
-    C21 = add(M2, M4)
-    C22 = add(sub(add(M1, M3), M2), M6)
+    if n <= cutoff:
+        _mul_base(A, B, C)
+        return True
 
-    C = combine(C11, C12, C21, C22)
+    if not raiz and gpu.usar_gpu(A, B):
+        gpu.mul_gpu(A, B, out=C)
+        return True
 
-    stats.split_combine_time += perf_counter() - t1
+    return False
 
-    return C
+
+def _produtos(A: Matrix, B: Matrix, bufs: List[Matrix]) -> Tuple[Product, ...]:
+    """
+    Particiona A e B e calcula as 8 somas/subtrações da variante de Winograd
+    nos buffers `bufs` (ver _scratch):
+      S1 = A21 + A22   S2 = S1 - A11   S3 = A11 - A21   S4 = A12 - S2
+      T1 = B12 - B11   T2 = B22 - T1   T3 = B22 - B12   T4 = T2 - B21
+    Retorna os 7 produtos (X, Y, P), com P = X @ Y a ser escrito nos 7
+    últimos buffers.
+    """
+    A11, A12, A21, A22 = split(A)
+    B11, B12, B21, B22 = split(B)
+
+    S1, S2, S3, S4, T1, T2, T3, T4, P1, P2, P3, P4, P5, P6, P7 = bufs
+
+    add(A21, A22, out=S1)
+    sub(S1, A11, out=S2)
+    sub(A11, A21, out=S3)
+    sub(A12, S2, out=S4)
+
+    sub(B12, B11, out=T1)
+    sub(B22, T1, out=T2)
+    sub(B22, B12, out=T3)
+    sub(T2, B21, out=T4)
+
+    return (
+        (S2, T2, P1),
+        (A11, B11, P2),
+        (A12, B21, P3),
+        (S4, B22, P4),
+        (S1, T1, P5),
+        (S3, T3, P6),
+        (A22, T4, P7),
+    )
+
+
+def _strassen_rec(
+    A: Matrix,
+    B: Matrix,
+    C: Matrix,
+    cutoff: int,
+    stats: StrassenStats,
+    pool: ScratchPool,
+    depth: int,
+    parallel_depth: int,
+    profile: bool,
+) -> None:
+    """
+    Níveis paralelos do Strassen: escreve A @ B em C.
+    Aqui contamos calls e, se profile=True, acumulamos split_combine_time.
+
+    depth < parallel_depth:
+      - As 7 chamadas recursivas são independentes e rodam em threads; cada uma
+        recebe seu próprio pool de buffers e suas próprias estatísticas, que são
+        somadas às do pai no final (split_combine_time vira a soma entre threads).
+
+    depth >= parallel_depth:
+      - O resto da árvore roda sequencialmente em _strassen_iter.
+    """
+    if depth >= parallel_depth:
+        _strassen_iter(A, B, C, cutoff, stats, pool, profile, depth == 0)
+        return
+
+    stats.calls += 1
+
+    if _caso_base(A, B, C, cutoff, depth == 0):
+        return
+
+    if profile:
+        t0 = perf_counter()
+    bufs = _scratch(pool, len(A) // 2, C.dtype)
+    products = _produtos(A, B, bufs)
+    if profile:
+        stats.split_combine_time += perf_counter() - t0
+
+    executor = _executor(depth)
+    tasks = []
+    for X, Y, M in products:
+        child = StrassenStats()
+        future = executor.submit(_strassen_rec, X, Y, M, cutoff, child, {}, depth + 1, parallel_depth, profile)
+        tasks.append((child, future))
+    for child, future in tasks:
+        future.result()
+        stats.calls += child.calls
+        stats.split_combine_time += child.split_combine_time
+
+    if profile:
+        t1 = perf_counter()
+    _combine(*bufs[_N_OPERANDOS:], C)
+    if profile:
+        stats.split_combine_time += perf_counter() - t1
+
+
+def _strassen_iter(
+    A: Matrix,
+    B: Matrix,
+    C: Matrix,
+    cutoff: int,
+    stats: StrassenStats,
+    pool: ScratchPool,
+    profile: bool,
+    raiz: bool = False,
+) -> None:
+    """
+    Strassen sequencial sem recursão: busca em profundidade com pilha explícita.
+    Cada quadro da pilha é [produtos, próximo produto, buffers, saída]; o quadro
+    dispara seus 7 produtos um de cada vez e, quando todos terminam, combina
+    P1..P7 na saída e sai da pilha. `calls` conta os quadros abertos, como
+    na versão recursiva.
+
+    Os tamanhos decrescem ao longo da pilha, então há no máximo um quadro por
+    tamanho e os buffers de _scratch (um conjunto por tamanho) nunca colidem.
+    raiz=True indica que (A, B, C) é a multiplicação inteira (ver _caso_base).
+    """
+    stack: List[list] = []
+    pending: Optional[Product] = (A, B, C)
+
+    while True:
+        if pending is not None:
+            X, Y, out = pending
+            pending = None
+            stats.calls += 1
+
+            if not _caso_base(X, Y, out, cutoff, raiz and not stack):
+                if profile:
+                    t0 = perf_counter()
+                bufs = _scratch(pool, len(X) // 2, out.dtype)
+                products = _produtos(X, Y, bufs)
+                if profile:
+                    stats.split_combine_time += perf_counter() - t0
+                stack.append([products, 0, bufs, out])
+
+        if not stack:
+            break
+
+        frame = stack[-1]
+        products, i, bufs, out = frame
+        if i < len(products):
+            frame[1] = i + 1
+            pending = products[i]
+        else:
+            stack.pop()
+            if profile:
+                t1 = perf_counter()
+            _combine(*bufs[_N_OPERANDOS:], out)
+            if profile:
+                stats.split_combine_time += perf_counter() - t1
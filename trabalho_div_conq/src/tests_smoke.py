@@ -1,30 +1,35 @@
 from __future__ import annotations
 
-import random
+import numpy as np
 
-from .classic import mul_classic, matrices_equal
-from .strassen import mul_strassen, StrassenStats
+from .classic import ATOL_FLOAT, mul_classic, mul_classic_tiled, matrices_equal
+from .classic_py import mul_classic_py
+from .strassen import make_strassen, mul_strassen, StrassenStats
 from .matrix import Matrix
 
 
 def gerar_matriz(n: int, seed: int, minimo: int = -5, maximo: int = 5) -> Matrix:
     """Gera uma matriz n x n com inteiros aleatórios usando seed fixa."""
-    rng = random.Random(seed)
-    return [[rng.randint(minimo, maximo) for _ in range(n)] for _ in range(n)]
+    return np.random.default_rng(seed).integers(minimo, maximo + 1, size=(n, n), dtype=np.int64)
 
 
 def garantir_iguais(C1: Matrix, C2: Matrix, msg: str) -> None:
-    """Se forem diferentes, mostra a primeira posição onde diverge."""
+    """
+    Se forem diferentes, mostra a primeira posição onde diverge
+    (com a mesma tolerância de matrices_equal em float).
+    """
     if matrices_equal(C1, C2):
         return
 
-    n = len(C1)
-    for i in range(n):
-        for j in range(n):
-            if C1[i][j] != C2[i][j]:
-                raise AssertionError(
-                    f"{msg}\nDiferença em ({i},{j}): clássico={C1[i][j]} strassen={C2[i][j]}"
-                )
+    C1 = np.asarray(C1)
+    C2 = np.asarray(C2)
+    if C1.shape == C2.shape:
+        flutuante = np.issubdtype(C1.dtype, np.floating) or np.issubdtype(C2.dtype, np.floating)
+        iguais = np.isclose(C1, C2, rtol=0, atol=ATOL_FLOAT if flutuante else 0)
+        for i, j in np.argwhere(~iguais)[:1]:
+            raise AssertionError(
+                f"{msg}\nDiferença em ({i},{j}): clássico={C1[i, j]} strassen={C2[i, j]}"
+            )
     raise AssertionError(msg)
 
 
@@ -64,21 +69,97 @@ def teste_aleatorios_pequenos() -> None:
 
 # test 3: Tamanhos que NÃO são potência de 2
 
-def teste_nao_potencia_de_2_padding() -> None:
-    tamanhos = [3, 5, 6, 10, 12]
+def teste_nao_potencia_de_2_peeling() -> None:
+    tamanhos = [3, 5, 6, 10, 12, 33, 63]
     for n in tamanhos:
         A = gerar_matriz(n, seed=3000 + n)
         B = gerar_matriz(n, seed=4000 + n)
         comparar_classico_vs_strassen(A, B, cutoff=4)
 
-    print("OK - teste_nao_potencia_de_2_padding (padding/crop funcionando)")
+    print("OK - teste_nao_potencia_de_2_peeling (peeling dinâmico funcionando)")
+
+
+# test 4: Baseline em Python puro bate com o clássico compilado
+
+def teste_classico_python_puro() -> None:
+    for n in [1, 2, 3, 7, 16]:
+        A = gerar_matriz(n, seed=5000 + n)
+        B = gerar_matriz(n, seed=6000 + n)
+        garantir_iguais(mul_classic(A, B), mul_classic_py(A.tolist(), B.tolist()), "Clássico != Python puro")
+
+    print("OK - teste_classico_python_puro (baseline em listas, B transposta)")
+
+
+# test 5: Versão em blocos (tiles) com n múltiplo ou não do tile
+
+def teste_classico_em_blocos() -> None:
+    for n in [1, 5, 8, 13, 32]:
+        A = gerar_matriz(n, seed=7000 + n)
+        B = gerar_matriz(n, seed=8000 + n)
+        for tile in [1, 4, 8]:
+            garantir_iguais(mul_classic(A, B), mul_classic_tiled(A, B, tile=tile), "Clássico != em blocos")
+
+    print("OK - teste_classico_em_blocos (cache blocking)")
+
+
+# test 6: Strassen com as 7 multiplicações em threads (mesmo em máquina de 1 CPU)
+
+def teste_strassen_paralelo() -> None:
+    for n in [8, 12, 32]:
+        A = gerar_matriz(n, seed=9000 + n)
+        B = gerar_matriz(n, seed=9500 + n)
+        C_seq, stats_seq = mul_strassen(A, B, cutoff=2, stats=StrassenStats(), parallel_depth=0)
+        C_par, stats_par = mul_strassen(A, B, cutoff=2, stats=StrassenStats(), parallel_depth=2)
+        garantir_iguais(C_seq, C_par, "Strassen sequencial != paralelo")
+        if stats_seq.calls != stats_par.calls:
+            raise AssertionError(f"calls diferentes: {stats_seq.calls} != {stats_par.calls}")
+
+    print("OK - teste_strassen_paralelo (threads nos 2 primeiros níveis)")
+
+
+# test 7: Strassen compilado (make_strassen) com cutoff e dtype fixos
+
+def teste_strassen_compilado() -> None:
+    mul = make_strassen(cutoff=4, dtype=np.int64)
+    for n in [1, 4, 9, 16, 33]:
+        A = gerar_matriz(n, seed=10000 + n)
+        B = gerar_matriz(n, seed=10500 + n)
+        garantir_iguais(mul_classic(A, B), mul(A, B), "Clássico != Strassen compilado")
+
+    print("OK - teste_strassen_compilado (make_strassen)")
+
+
+# test 8: Operandos com dtypes diferentes usam um dtype comum
+
+def teste_dtypes_mistos() -> None:
+    n = 20
+    A = gerar_matriz(n, seed=11000)
+    B = gerar_matriz(n, seed=11500)
+    esperado = mul_classic(A, B)
+
+    for dtA, dtB in [(np.int64, np.float32), (np.float32, np.int64), (np.int32, np.float16), (np.float16, np.float16)]:
+        A_mix = A.astype(dtA)
+        B_mix = B.astype(dtB)
+        C_classico = mul_classic(A_mix, B_mix)
+        C_strassen, _ = mul_strassen(A_mix, B_mix, cutoff=4)
+        if not np.issubdtype(C_classico.dtype, np.floating) or C_strassen.dtype != C_classico.dtype:
+            raise AssertionError(f"dtype inesperado para {dtA.__name__} x {dtB.__name__}: {C_classico.dtype}")
+        garantir_iguais(esperado, C_classico, f"Clássico errado para {dtA.__name__} x {dtB.__name__}")
+        garantir_iguais(esperado, C_strassen, f"Strassen errado para {dtA.__name__} x {dtB.__name__}")
+
+    print("OK - teste_dtypes_mistos (int x float, float16 -> float64)")
 
 
 def main() -> None:
     print("Rodando testes (validação do Strassen comparando com o clássico)...\n")
     teste_fixo_2x2()
     teste_aleatorios_pequenos()
-    teste_nao_potencia_de_2_padding()
+    teste_nao_potencia_de_2_peeling()
+    teste_classico_python_puro()
+    teste_classico_em_blocos()
+    teste_strassen_paralelo()
+    teste_strassen_compilado()
+    teste_dtypes_mistos()
     print("\nOK - Todos os testes passaram! Strassen e Clássico estão consistentes.")
 
 